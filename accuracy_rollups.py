@@ -0,0 +1,203 @@
+import os
+import sys
+import logging
+
+from dotenv import load_dotenv
+import mysql.connector
+
+# 加载环境变量
+load_dotenv()
+
+MODELS = {
+    'logistic_regression': 'home_win_probability_logistic',
+    'random_forest': 'home_win_probability_rf',
+}
+
+DIMENSIONS = ['overall', 'season', 'season_type', 'team', 'confidence']
+
+CONFIDENCE_BUCKETS = [
+    (0.6, '50-60%'),
+    (0.7, '60-70%'),
+    (0.8, '70-80%'),
+    (0.9, '80-90%'),
+    (1.01, '90-100%'),
+]
+
+# 尚未计入汇总的已结束比赛，{0} 为可选的热分区条件
+NEW_GAMES_QUERY = """
+    SELECT
+        gpr.id,
+        gpr.season,
+        gpr.season_type,
+        gpr.home_team_id,
+        gpr.away_team_id,
+        gpr.home_team_score,
+        gpr.away_team_score,
+        gpr.home_win_probability_logistic,
+        gpr.home_win_probability_rf
+    FROM game_predictions_results gpr
+    LEFT JOIN accuracy_rollup_games arg ON arg.game_id = gpr.id
+    WHERE gpr.game_status = 3
+        AND gpr.home_team_score IS NOT NULL
+        AND gpr.away_team_score IS NOT NULL
+        AND arg.game_id IS NULL
+        {0}
+"""
+
+# 按主键前缀读取汇总表，行数与比赛数量无关
+BREAKDOWN_QUERY = """
+    SELECT ar.dim_value, ar.model, ar.total_games, ar.correct_games, t.team_name
+    FROM accuracy_rollups ar
+    LEFT JOIN teams t ON ar.dimension = 'team' AND t.team_id = ar.dim_value
+    WHERE ar.dimension = %s
+    ORDER BY ar.dim_value
+"""
+
+def create_rollup_tables(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS accuracy_rollups (
+            dimension VARCHAR(20) NOT NULL,
+            dim_value VARCHAR(64) NOT NULL,
+            model VARCHAR(32) NOT NULL,
+            total_games INT NOT NULL DEFAULT 0,
+            correct_games INT NOT NULL DEFAULT 0,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (dimension, dim_value, model)
+        )
+    """)
+    # 已计入汇总的比赛，保证每场比赛只累加一次
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS accuracy_rollup_games (
+            game_id INT PRIMARY KEY,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    logging.info("Created accuracy rollup tables")
+
+def confidence_bucket(home_win_prob):
+    confidence = max(home_win_prob, 1 - home_win_prob)
+    for upper, label in CONFIDENCE_BUCKETS:
+        if confidence < upper:
+            return label
+    return CONFIDENCE_BUCKETS[-1][1]
+
+def game_rollup_deltas(game):
+    # 每个模型分别判断对错：概率 > 0.5 视为预测主队获胜。
+    # 这与仪表板 page_stats 使用的 prediction_correct（单一预测结果）不是同一口径，
+    # 分析页面展示的是两个模型各自的准确率
+    home_won = game['home_team_score'] > game['away_team_score']
+    deltas = []
+    for model, column in MODELS.items():
+        home_win_prob = float(game[column])
+        correct = int((home_win_prob > 0.5) == home_won)
+        keys = [
+            ('overall', 'all'),
+            ('season', str(game['season'])),
+            ('season_type', str(game['season_type'])),
+            ('team', str(game['home_team_id'])),
+            ('team', str(game['away_team_id'])),
+            ('confidence', confidence_bucket(home_win_prob)),
+        ]
+        for dimension, dim_value in keys:
+            deltas.append((dimension, dim_value, model, correct))
+    return deltas
+
+def apply_new_games(cursor, hot_start=None):
+    # 只处理尚未计入汇总的已结束比赛；传入 hot_start 时只扫描未归档的分区
+    hot_condition = "AND gpr.game_date >= %s" if hot_start else ""
+    cursor.execute(NEW_GAMES_QUERY.format(hot_condition), (hot_start,) if hot_start else ())
+    columns = [column[0] for column in cursor.description]
+    games = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    if not games:
+        logging.info("No newly finished games for accuracy rollups")
+        return 0
+
+    totals = {}
+    for game in games:
+        for dimension, dim_value, model, correct in game_rollup_deltas(game):
+            key = (dimension, dim_value, model)
+            total, correct_total = totals.get(key, (0, 0))
+            totals[key] = (total + 1, correct_total + correct)
+
+    cursor.executemany("""
+        INSERT INTO accuracy_rollups (dimension, dim_value, model, total_games, correct_games)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            total_games = total_games + VALUES(total_games),
+            correct_games = correct_games + VALUES(correct_games)
+    """, [key + value for key, value in totals.items()])
+    cursor.executemany(
+        "INSERT INTO accuracy_rollup_games (game_id) VALUES (%s)",
+        [(game['id'],) for game in games]
+    )
+    logging.info(f"Applied {len(games)} finished games to accuracy rollups")
+    return len(games)
+
+def rebuild_rollups(cursor):
+    # 比分修正或重新计算概率后重建汇总：清空两张表后重新计入所有已结束比赛。
+    # 已归档赛季的数据仍保留在 p_archive 分区中，这里不传 hot_start，一次性全表扫描
+    create_rollup_tables(cursor)
+    cursor.execute("DELETE FROM accuracy_rollups")
+    cursor.execute("DELETE FROM accuracy_rollup_games")
+    return apply_new_games(cursor)
+
+def get_breakdown(cursor, dimension):
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"Unknown dimension: {dimension}")
+
+    cursor.execute(BREAKDOWN_QUERY, (dimension,))
+
+    breakdown = {}
+    for dim_value, model, total_games, correct_games, team_name in cursor.fetchall():
+        row = breakdown.setdefault(dim_value, {
+            'value': dim_value,
+            'label': team_name or dim_value,
+            'models': {}
+        })
+        row['models'][model] = {
+            'total_games': total_games,
+            'correct_games': correct_games,
+            'accuracy_rate': (correct_games / total_games * 100) if total_games > 0 else 0
+        }
+    return sorted(breakdown.values(), key=lambda row: row['label'])
+
+def get_db_connection():
+    return mysql.connector.connect(
+        host=os.getenv('MYSQLHOST'),
+        user=os.getenv('MYSQLUSER'),
+        password=os.getenv('MYSQLPASSWORD'),
+        database=os.getenv('MYSQL_DATABASE'),
+        port=int(os.getenv('MYSQLPORT', 3306))
+    )
+
+def main():
+    # 配置日志
+    logging.basicConfig(level=logging.INFO,
+                       format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if sys.argv[1:] != ['rebuild']:
+        print("Usage: python accuracy_rollups.py rebuild")
+        sys.exit(1)
+
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        # DELETE 而不是 TRUNCATE，清空和重新计入在同一个事务中提交
+        games = rebuild_rollups(cursor)
+        conn.commit()
+        logging.info(f"Rebuilt accuracy rollups from {games} finished games")
+    except Exception as e:
+        logging.error(f"Error rebuilding accuracy rollups: {e}")
+        if conn:
+            conn.rollback()
+        sys.exit(1)
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.middleware.proxy_fix import ProxyFix
+from sqlalchemy.exc import IntegrityError
 import os
 from dotenv import load_dotenv
 from flask_wtf import FlaskForm
@@ -13,13 +14,50 @@ import time
 import mysql.connector
 from mysql.connector import Error
 import logging
+import gzip
 from datetime import datetime, timedelta
+from shared_cache import cache
+import prediction_snapshot
+from dashboard_snapshot import DashboardSnapshot
+import accuracy_rollups
+from login_guard import LoginGuard, LoginBusyError
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 load_dotenv()
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key')
 
+# 部署在反向代理之后时，按代理层数信任 X-Forwarded-For 获取客户端 IP。
+# Vercel（运行时设置 VERCEL=1）前面有一层代理，默认信任一层
+PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', '1' if os.environ.get('VERCEL') else '0'))
+if PROXY_FIX_X_FOR:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=PROXY_FIX_X_FOR)
+
+# 去掉模板标签产生的多余空行和缩进
+app.jinja_env.trim_blocks = True
+app.jinja_env.lstrip_blocks = True
+
+# 响应压缩：小于阈值的响应不压缩
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '1024'))
+COMPRESS_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/javascript',
+    'application/javascript', 'application/json', 'image/svg+xml'
+}
+
+# build_assets.py 生成的 Tailwind 和图标 CSS 是否存在
+BUILT_ASSETS = all(
+    os.path.exists(os.path.join(app.static_folder, 'css', filename))
+    for filename in ('tailwind.min.css', 'icons.min.css')
+)
+
+# 预测数据缓存时间（秒），比赛数据只在比赛结束后变化
+PREDICTIONS_CACHE_TTL = int(os.environ.get('PREDICTIONS_CACHE_TTL', '300'))
+
 # 数据库配置部分
 def get_database_url():
     config = {
@@ -75,6 +113,15 @@ def get_db_connection():
         app.logger.error(f"Error connecting to MySQL: {e}")
         raise
 
+# 仪表板快照，后台线程按 DASHBOARD_REFRESH_INTERVAL 秒刷新；
+# 访问量每 DASHBOARD_VIEW_FLUSH_THRESHOLD 次或 DASHBOARD_VIEW_FLUSH_INTERVAL 秒写回一次
+dashboard_snapshot = DashboardSnapshot(
+    get_db_connection,
+    interval=int(os.environ.get('DASHBOARD_REFRESH_INTERVAL', '60')),
+    flush_threshold=int(os.environ.get('DASHBOARD_VIEW_FLUSH_THRESHOLD', '20')),
+    flush_interval=int(os.environ.get('DASHBOARD_VIEW_FLUSH_INTERVAL', '30'))
+)
+
 def check_db_connection():
     max_retries = 3
     retry_count = 0
@@ -93,11 +140,65 @@ def check_db_connection():
             time.sleep(1)  # 等待1秒后重试
     return False
 
+# 快照模式下由本地快照提供数据、不访问 MySQL 的路由
+SNAPSHOT_ENDPOINTS = {'predict', 'api_predictions'}
+
 @app.before_request
 def before_request():
+    # 静态文件不需要数据库
+    if request.endpoint == 'static':
+        return
+    if request.endpoint in SNAPSHOT_ENDPOINTS and prediction_snapshot.snapshot_enabled():
+        return
+    if request.endpoint == 'dashboard' and dashboard_snapshot.is_ready():
+        return
     if not check_db_connection():
         return jsonify({"error": "Database connection failed"}), 503
 
+@app.after_request
+def compress_response(response):
+    if (response.status_code != 200
+            or response.mimetype not in COMPRESS_MIMETYPES
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    # 静态文件默认直接透传文件对象，压缩前需要先读出内容
+    response.direct_passthrough = False
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    # 只有可能被压缩的响应才会随 Accept-Encoding 变化
+    response.vary.add('Accept-Encoding')
+    if brotli is not None and request.accept_encodings['br']:
+        encoding = 'br'
+    elif request.accept_encodings['gzip']:
+        encoding = 'gzip'
+    else:
+        return response
+
+    # 不同编码的内容不同，ETag 也要区分。send_file 已经按原始 ETag 做过条件判断，
+    # 改名后要按新 ETag 重新判断，否则浏览器带回的 If-None-Match 永远不匹配；
+    # 命中时直接返回 304，不必再压缩
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+
+    if encoding == 'br':
+        response.set_data(brotli.compress(data, quality=5))
+    else:
+        response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+@app.context_processor
+def inject_built_assets():
+    # 执行过 build_assets.py 时使用本地精简后的 CSS，否则回退到 CDN
+    return {'built_assets': BUILT_ASSETS}
+
 @app.teardown_request
 def teardown_request(exception=None):
     if exception:
@@ -114,6 +215,25 @@ def init_db():
             print(f"Database initialization failed: {str(e)}")
             raise
 
+# 密码哈希线程池和登录限流
+login_guard = LoginGuard(
+    workers=int(os.environ.get('LOGIN_HASH_WORKERS', '2')),
+    queue_limit=int(os.environ.get('LOGIN_HASH_QUEUE_LIMIT', '8')),
+    ip_rate=float(os.environ.get('LOGIN_IP_PER_MINUTE', '12')) / 60,
+    user_rate=float(os.environ.get('LOGIN_USER_PER_MINUTE', '3')) / 60
+)
+
+_untrusted_proxy_warned = False
+
+def client_ip():
+    # 登录限流的 key；经过代理却没有信任 X-Forwarded-For 时，所有用户会共用代理的 IP 桶
+    global _untrusted_proxy_warned
+    if not PROXY_FIX_X_FOR and 'X-Forwarded-For' in request.headers and not _untrusted_proxy_warned:
+        app.logger.error("X-Forwarded-For is present but PROXY_FIX_X_FOR is 0: login rate limits "
+                         "are keyed on the proxy address. Set PROXY_FIX_X_FOR to the number of proxies.")
+        _untrusted_proxy_warned = True
+    return request.remote_addr
+
 # 初始化登录管理器
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -129,13 +249,25 @@ class User(UserMixin, db.Model):
         return f'<User {self.username}>'
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = login_guard.hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return login_guard.check_password(self.password_hash, password)
+
+# 由已签名的 session 构造的轻量用户，只包含页面用到的 id 和用户名
+class SessionUser(UserMixin):
+    def __init__(self, user_id, username):
+        self.id = user_id
+        self.username = username
+
+# 这些路由只需要用户 id 和用户名，直接从 session 读取，不访问 MySQL
+SESSION_USER_ENDPOINTS = SNAPSHOT_ENDPOINTS | {'dashboard'}
 
 @login_manager.user_loader
 def load_user(user_id):
+    username = session.get('username')
+    if username and request.endpoint in SESSION_USER_ENDPOINTS:
+        return SessionUser(int(user_id), username)
     return User.query.get(int(user_id))
 
 # Routes
@@ -155,14 +287,11 @@ def register():
     
     form = RegistrationForm()
     if form.validate_on_submit():
+        if not login_guard.allow(client_ip()):
+            flash('Too many attempts. Please wait a moment and try again.', 'error')
+            return render_template('register.html', form=form), 429
         try:
-            # 检查用户名是否已存在
-            existing_user = User.query.filter_by(username=form.username.data).first()
-            if existing_user:
-                flash('Username already exists. Please choose a different one.', 'error')
-                return render_template('register.html', form=form)
-            
-            # 创建新用户
+            # 创建新用户，用户名重复由唯一索引判断，不再预先查询
             user = User(username=form.username.data)
             user.set_password(form.password.data)
             db.session.add(user)
@@ -170,6 +299,13 @@ def register():
             print(f"New user registered: {user.username}")
             flash('Your account has been created! You can now log in.', 'success')
             return redirect(url_for('login'))
+        except IntegrityError:
+            db.session.rollback()
+            flash('Username already exists. Please choose a different one.', 'error')
+            return render_template('register.html', form=form)
+        except LoginBusyError:
+            flash('The server is busy. Please try again in a moment.', 'error')
+            return render_template('register.html', form=form), 503
         except Exception as e:
             db.session.rollback()
             print(f"Error in registration: {str(e)}")
@@ -183,20 +319,35 @@ def register():
 def login():
     try:
         if request.method == 'POST':
-            username = request.form.get('username')
+            username = request.form.get('username') or ''
             password = request.form.get('password')
+            # 按 IP 和用户名分别限流
+            if not login_guard.allow(client_ip(), username):
+                flash('Too many login attempts. Please wait a moment and try again.')
+                return render_template('login.html'), 429
             user = User.query.filter_by(username=username).first()
-            if user and user.check_password(password):
+            # 用户不存在时同样做一次哈希校验，保持响应耗时一致
+            password_hash = user.password_hash if user else None
+            if login_guard.check_password(password_hash, password) and user:
                 login_user(user)
+                session['username'] = user.username
                 print(f"User {username} logged in successfully")
                 return redirect(url_for('dashboard'))
             print(f"Failed login attempt for username: {username}")
             flash('Invalid username or password')
         return render_template('login.html')
+    except LoginBusyError:
+        flash('The server is busy. Please try again in a moment.')
+        return render_template('login.html'), 503
     except Exception as e:
         print(f"Error in login route: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/auth/hash-latency')
+@login_required
+def api_hash_latency():
+    return jsonify(login_guard.latency_stats())
+
 class RegistrationForm(FlaskForm):
     username = StringField('Username', validators=[DataRequired(), Length(min=4, max=20)])
     password = PasswordField('Password', validators=[DataRequired(), Length(min=6)])
@@ -209,99 +360,13 @@ class RegistrationForm(FlaskForm):
 @login_required
 def dashboard():
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor(dictionary=True)
-            
-            # 获取页面统计数据
-            cursor.execute("""
-                SELECT 
-                    total_page_views,
-                    total_predictions,
-                    correct_predictions,
-                    accuracy_rate,
-                    last_update
-                FROM page_stats
-                WHERE id = 1
-            """)
-            stats = cursor.fetchone()
-            
-            if not stats:
-                stats = {
-                    'total_page_views': 0,
-                    'total_predictions': 0,
-                    'correct_predictions': 0,
-                    'accuracy_rate': 0,
-                    'last_update': datetime.now()
-                }
-                
-                # 创建初始记录
-                cursor.execute("""
-                    INSERT INTO page_stats 
-                        (total_page_views, total_predictions, correct_predictions, accuracy_rate, last_update)
-                    VALUES 
-                        (0, 0, 0, 0, NOW())
-                """)
-            
-            # 更新总访问量
-            cursor.execute("""
-                UPDATE page_stats 
-                SET total_page_views = total_page_views + 1,
-                    last_update = NOW()
-                WHERE id = 1
-            """)
-            
-            # 更新统计数据中的访问量
-            stats['total_page_views'] += 1
-            
-            # 获取最近5场比赛的预测
-            cursor.execute("""
-                SELECT 
-                    gpr.game_date,
-                    gpr.season,
-                    gpr.season_type,
-                    gpr.game_status,
-                    gpr.game_status_text,
-                    gpr.home_team_score,
-                    gpr.away_team_score,
-                    gpr.home_win_probability_logistic,
-                    gpr.home_win_probability_rf,
-                    gpr.prediction_correct,
-                    gpr.arena_name,
-                    gpr.arena_city,
-                    ht.team_name as home_team,
-                    at.team_name as away_team
-                FROM game_predictions_results gpr
-                JOIN teams ht ON gpr.home_team_id = ht.team_id
-                JOIN teams at ON gpr.away_team_id = at.team_id
-                WHERE gpr.game_date >= CURDATE()
-                ORDER BY gpr.game_date ASC, gpr.id ASC
-                LIMIT 5
-            """)
-            upcoming_games = cursor.fetchall()
-            
-            # 格式化比赛数据
-            formatted_games = []
-            for game in upcoming_games:
-                # 计算主队和客队的胜率
-                lr_home_prob = float(game['home_win_probability_logistic'])
-                rf_home_prob = float(game['home_win_probability_rf'])
-                
-                formatted_game = {
-                    'game_date': game['game_date'],
-                    'home_team_name': game['home_team'],
-                    'away_team_name': game['away_team'],
-                    'home_win_probability_logistic': lr_home_prob,
-                    'away_win_probability_logistic': 1 - lr_home_prob,
-                    'home_win_probability_rf': rf_home_prob,
-                    'away_win_probability_rf': 1 - rf_home_prob
-                }
-                formatted_games.append(formatted_game)
-            
-            conn.commit()
-            
-            return render_template('dashboard.html', 
-                                 stats=stats,
-                                 upcoming_games=formatted_games)
+        # 只读取后台刷新的快照，访问量在内存中累加后批量写回
+        dashboard_snapshot.record_page_view()
+        stats, upcoming_games = dashboard_snapshot.get()
+
+        return render_template('dashboard.html', 
+                             stats=stats,
+                             upcoming_games=upcoming_games)
                                  
     except Exception as e:
         app.logger.error(f"Error in dashboard route: {str(e)}")
@@ -313,166 +378,229 @@ def logout():
     try:
         username = current_user.username
         logout_user()
+        session.pop('username', None)
         print(f"User {username} logged out")
         return redirect(url_for('index'))
     except Exception as e:
         print(f"Error in logout route: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
-@app.route('/predict')
-def predict():
-    try:
-        # Get pagination and sorting parameters
-        page = request.args.get('page', 1, type=int)
-        sort_order = request.args.get('sort', 'asc')  # 'asc' or 'desc'
-        date_filter = request.args.get('date_filter', '7d')  # Changed default to '7d'
-        start_date = request.args.get('start_date')  # YYYY-MM-DD format for custom date
-        
-        per_page = 10  # Number of predictions per page
-        offset = (page - 1) * per_page
+def fetch_predictions(date_condition, query_params, sort_order, per_page, offset):
+    # 有可用的本地快照时直接读取，不产生任何远程数据库请求
+    if prediction_snapshot.snapshot_enabled():
+        return prediction_snapshot.query_snapshot(
+            date_condition, query_params, sort_order, per_page, offset)
 
-        # Build date filter condition
-        date_condition = ""
-        query_params = []
-        today = datetime.now().date()
-        
-        if date_filter == '7d':
-            date_condition = "AND game_date BETWEEN %s AND %s"
-            query_params = [today, today + timedelta(days=7)]
-        elif date_filter == '30d':
-            date_condition = "AND game_date BETWEEN %s AND %s"
-            query_params = [today, today + timedelta(days=30)]
-        elif date_filter == '1y':
-            date_condition = "AND game_date BETWEEN %s AND %s"
-            query_params = [today, today + timedelta(days=365)]
-        elif date_filter == 'custom' and start_date:
-            try:
-                custom_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-                date_condition = "AND game_date = %s"
-                query_params = [custom_date]
-            except ValueError:
-                app.logger.error(f"Invalid date format: {start_date}")
-                return render_template('error.html', error="Invalid date format. Please use YYYY-MM-DD")
-        elif date_filter == 'all':
-            date_condition = ""
-            query_params = []
+    cache_key = 'predict:{}:{}:{}:{}:{}'.format(
+        sort_order, per_page, offset, date_condition,
+        ','.join(str(param) for param in query_params))
 
+    def load():
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
-
         try:
             # Get total count
-            count_query = f'SELECT COUNT(*) as count FROM game_predictions_results WHERE 1=1 {date_condition}'
-            cursor.execute(count_query, query_params)
+            cursor.execute(prediction_snapshot.PREDICTIONS_COUNT_QUERY.format(date_condition), query_params)
             total_records = cursor.fetchone()['count']
-            total_pages = (total_records + per_page - 1) // per_page
 
             # Get predictions
-            query = '''
-                SELECT 
-                    gpr.id,
-                    gpr.game_date,
-                    gpr.season,
-                    gpr.season_type,
-                    gpr.game_status,
-                    gpr.game_status_text,
-                    gpr.home_team_score,
-                    gpr.away_team_score,
-                    gpr.home_win_probability_logistic,
-                    gpr.home_win_probability_rf,
-                    gpr.prediction_correct,
-                    gpr.arena_name,
-                    gpr.arena_city,
-                    ht.team_name as home_team,
-                    at.team_name as away_team
-                FROM game_predictions_results gpr
-                JOIN teams ht ON gpr.home_team_id = ht.team_id
-                JOIN teams at ON gpr.away_team_id = at.team_id
-                WHERE 1=1 {0}
-                ORDER BY gpr.game_date {1}, gpr.id {1}
-                LIMIT %s OFFSET %s
-            '''.format(date_condition, 'ASC' if sort_order == 'asc' else 'DESC')
-            
+            query = prediction_snapshot.PREDICTIONS_PAGE_QUERY.format(
+                date_condition, 'ASC' if sort_order == 'asc' else 'DESC')
+
             all_params = query_params + [per_page, offset]
             cursor.execute(query, all_params)
-            predictions_data = cursor.fetchall()
-
-            # Format predictions
-            predictions = []
-            for pred in predictions_data:
-                lr_home_prob = float(pred['home_win_probability_logistic'])
-                rf_home_prob = float(pred['home_win_probability_rf'])
-                
-                lr_prediction = {
-                    'winner': pred['home_team'] if lr_home_prob > 0.5 else pred['away_team'],
-                    'probability': max(lr_home_prob, 1 - lr_home_prob) * 100
-                }
-                
-                rf_prediction = {
-                    'winner': pred['home_team'] if rf_home_prob > 0.5 else pred['away_team'],
-                    'probability': max(rf_home_prob, 1 - rf_home_prob) * 100
-                }
-
-                prediction = {
-                    'game_info': {
-                        'date': pred['game_date'],
-                        'season': pred['season'],
-                        'season_type': pred['season_type']
-                    },
-                    'teams': {
-                        'home_team': pred['home_team'],
-                        'away_team': pred['away_team']
-                    },
-                    'score': {
-                        'home_score': pred['home_team_score'],
-                        'away_score': pred['away_team_score'],
-                        'status': pred['game_status_text']
-                    },
-                    'venue': {
-                        'arena': pred['arena_name'],
-                        'city': pred['arena_city']
-                    },
-                    'model_predictions': {
-                        'logistic_regression': {
-                            'home_win_prob': lr_home_prob,
-                            'away_win_prob': 1 - lr_home_prob,
-                            'prediction': lr_prediction
-                        },
-                        'random_forest': {
-                            'home_win_prob': rf_home_prob,
-                            'away_win_prob': 1 - rf_home_prob,
-                            'prediction': rf_prediction
-                        }
-                    },
-                    'prediction_result': {
-                        'status': pred['game_status_text'],
-                        'correct': bool(pred['prediction_correct']) if pred['game_status'] == 3 else None
-                    }
-                }
-                predictions.append(prediction)
-
+            return total_records, cursor.fetchall()
+        finally:
             cursor.close()
             conn.close()
 
-            return render_template('predict.html',
-                                predictions=predictions,
-                                page=page,
-                                total_pages=total_pages,
-                                total_records=total_records,
-                                sort_order=sort_order,
-                                date_filter=date_filter,
-                                start_date=start_date)
+    return cache.get_or_set(cache_key, load, PREDICTIONS_CACHE_TTL)
+
+def build_date_filter(date_filter, start_date=None):
+    today = datetime.now().date()
+
+    if date_filter == '7d':
+        return "AND game_date BETWEEN %s AND %s", [today, today + timedelta(days=7)]
+    elif date_filter == '30d':
+        return "AND game_date BETWEEN %s AND %s", [today, today + timedelta(days=30)]
+    elif date_filter == '1y':
+        return "AND game_date BETWEEN %s AND %s", [today, today + timedelta(days=365)]
+    elif date_filter == 'custom' and start_date:
+        # 日期格式错误时抛出 ValueError
+        custom_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+        return "AND game_date = %s", [custom_date]
+    return "", []
+
+def format_prediction(pred):
+    lr_home_prob = float(pred['home_win_probability_logistic'])
+    rf_home_prob = float(pred['home_win_probability_rf'])
+    
+    lr_prediction = {
+        'winner': pred['home_team'] if lr_home_prob > 0.5 else pred['away_team'],
+        'probability': max(lr_home_prob, 1 - lr_home_prob) * 100
+    }
+    
+    rf_prediction = {
+        'winner': pred['home_team'] if rf_home_prob > 0.5 else pred['away_team'],
+        'probability': max(rf_home_prob, 1 - rf_home_prob) * 100
+    }
 
-        except Exception as e:
-            cursor.close()
-            conn.close()
-            raise e
+    prediction = {
+        'game_info': {
+            'date': pred['game_date'],
+            'season': pred['season'],
+            'season_type': pred['season_type']
+        },
+        'teams': {
+            'home_team': pred['home_team'],
+            'away_team': pred['away_team']
+        },
+        'score': {
+            'home_score': pred['home_team_score'],
+            'away_score': pred['away_team_score'],
+            'status': pred['game_status_text']
+        },
+        'venue': {
+            'arena': pred['arena_name'],
+            'city': pred['arena_city']
+        },
+        'model_predictions': {
+            'logistic_regression': {
+                'home_win_prob': lr_home_prob,
+                'away_win_prob': 1 - lr_home_prob,
+                'prediction': lr_prediction
+            },
+            'random_forest': {
+                'home_win_prob': rf_home_prob,
+                'away_win_prob': 1 - rf_home_prob,
+                'prediction': rf_prediction
+            }
+        },
+        'prediction_result': {
+            'status': pred['game_status_text'],
+            'correct': bool(pred['prediction_correct']) if pred['game_status'] == 3 else None
+        }
+    }
+    return prediction
+
+@app.route('/predict')
+def predict():
+    try:
+        # Get pagination and sorting parameters
+        page = max(1, request.args.get('page', 1, type=int))
+        sort_order = request.args.get('sort', 'asc')  # 'asc' or 'desc'
+        date_filter = request.args.get('date_filter', '7d')  # Changed default to '7d'
+        start_date = request.args.get('start_date')  # YYYY-MM-DD format for custom date
+        
+        per_page = 10  # Number of predictions per page
+        offset = (page - 1) * per_page
+
+        # Build date filter condition
+        try:
+            date_condition, query_params = build_date_filter(date_filter, start_date)
+        except ValueError:
+            app.logger.error(f"Invalid date format: {start_date}")
+            return render_template('error.html', error="Invalid date format. Please use YYYY-MM-DD")
+
+        total_records, predictions_data = fetch_predictions(
+            date_condition, query_params, sort_order, per_page, offset)
+        total_pages = (total_records + per_page - 1) // per_page
+
+        # Format predictions
+        predictions = [format_prediction(pred) for pred in predictions_data]
+
+        return render_template('predict.html',
+                            predictions=predictions,
+                            page=page,
+                            total_pages=total_pages,
+                            total_records=total_records,
+                            sort_order=sort_order,
+                            date_filter=date_filter,
+                            start_date=start_date)
 
     except Exception as e:
         app.logger.error(f"Error in predict route: {str(e)}")
         app.logger.error(traceback.format_exc())
         return render_template('error.html', error="An error occurred while loading predictions")
 
+@app.route('/api/predictions')
+def api_predictions():
+    try:
+        # page 从 1 开始，per_page 限制在 1-100，避免负数 LIMIT 在 SQLite 中表示不限制
+        page = max(1, request.args.get('page', 1, type=int))
+        per_page = max(1, min(request.args.get('per_page', 10, type=int), 100))
+        sort_order = request.args.get('sort', 'asc')
+        date_filter = request.args.get('date_filter', '7d')
+        start_date = request.args.get('start_date')
+
+        try:
+            date_condition, query_params = build_date_filter(date_filter, start_date)
+        except ValueError:
+            return jsonify({"error": "Invalid date format. Please use YYYY-MM-DD"}), 400
+
+        total_records, predictions_data = fetch_predictions(
+            date_condition, query_params, sort_order, per_page, (page - 1) * per_page)
+
+        predictions = []
+        for pred in predictions_data:
+            prediction = format_prediction(pred)
+            prediction['game_info']['date'] = pred['game_date'].isoformat()
+            predictions.append(prediction)
+
+        return jsonify({
+            'predictions': predictions,
+            'page': page,
+            'per_page': per_page,
+            'total_records': total_records,
+            'total_pages': (total_records + per_page - 1) // per_page,
+            'snapshot_age': prediction_snapshot.snapshot_age() if prediction_snapshot.snapshot_enabled() else None
+        })
+    except Exception as e:
+        app.logger.error(f"Error in predictions API: {str(e)}")
+        return jsonify({"error": "An error occurred while loading predictions"}), 500
+
+def fetch_accuracy_breakdown(dimension):
+    def load():
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                return accuracy_rollups.get_breakdown(cursor, dimension)
+            finally:
+                cursor.close()
+
+    return cache.get_or_set(f'analytics:{dimension}', load, PREDICTIONS_CACHE_TTL)
+
+@app.route('/analytics')
+@login_required
+def analytics():
+    try:
+        dimension = request.args.get('dimension', 'team')
+        if dimension not in accuracy_rollups.DIMENSIONS:
+            return render_template('error.html', error="Unknown breakdown dimension")
+
+        return render_template('analytics.html',
+                             dimension=dimension,
+                             dimensions=accuracy_rollups.DIMENSIONS,
+                             breakdown=fetch_accuracy_breakdown(dimension))
+    except Exception as e:
+        app.logger.error(f"Error in analytics route: {str(e)}")
+        return render_template('error.html', error="An error occurred while loading analytics")
+
+@app.route('/api/analytics/accuracy')
+@login_required
+def api_accuracy_breakdown():
+    dimension = request.args.get('dimension', 'overall')
+    if dimension not in accuracy_rollups.DIMENSIONS:
+        return jsonify({"error": f"Unknown dimension: {dimension}"}), 400
+    try:
+        return jsonify({
+            'dimension': dimension,
+            'breakdown': fetch_accuracy_breakdown(dimension)
+        })
+    except Exception as e:
+        app.logger.error(f"Error in accuracy API: {str(e)}")
+        return jsonify({"error": "An error occurred while loading analytics"}), 500
+
 @app.route('/models')
 @login_required
 def models():
@@ -0,0 +1,105 @@
+import os
+import re
+import sys
+import glob
+import shutil
+import subprocess
+import urllib.request
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CSS_DIR = os.path.join(BASE_DIR, 'static', 'css')
+
+TAILWIND_INPUT = os.path.join(CSS_DIR, 'tailwind.input.css')
+TAILWIND_OUTPUT = os.path.join(CSS_DIR, 'tailwind.min.css')
+ICONS_OUTPUT = os.path.join(CSS_DIR, 'icons.min.css')
+
+FONT_AWESOME_CDN = 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0'
+
+def build_tailwind():
+    # 使用 tailwind CLI 按模板实际用到的类生成精简后的 CSS；
+    # 首次运行需要从 npm 下载 CLI，无法联网时 npx 会一直等待，因此设置超时
+    npx = shutil.which('npx')
+    if not npx:
+        raise RuntimeError("npx not found, install Node.js to build Tailwind CSS")
+
+    subprocess.run([
+        npx, '--yes', 'tailwindcss@3',
+        '-c', os.path.join(BASE_DIR, 'tailwind.config.js'),
+        '-i', TAILWIND_INPUT,
+        '-o', TAILWIND_OUTPUT,
+        '--minify'
+    ], check=True, cwd=BASE_DIR, timeout=300)
+    print(f"Built {TAILWIND_OUTPUT} ({os.path.getsize(TAILWIND_OUTPUT)} bytes)")
+
+def find_used_icons():
+    used = set()
+    for path in glob.glob(os.path.join(BASE_DIR, 'templates', '**', '*.html'), recursive=True):
+        with open(path, encoding='utf-8') as f:
+            used.update(re.findall(r'\bfa-[a-z0-9-]+', f.read()))
+    return used
+
+def split_rules(css):
+    # 按顶层花括号拆分规则（@keyframes 等嵌套规则作为一个整体）
+    rules = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(css):
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                rules.append(css[start:index + 1].strip())
+                start = index + 1
+    return [rule for rule in rules if rule]
+
+def subset_icons(css, used):
+    kept = []
+    for rule in split_rules(css):
+        selector, body = rule.split('{', 1)
+        selector = selector.strip()
+
+        if selector.startswith('@font-face'):
+            # 只保留 solid 和 brands 字体，字体文件继续从 CDN 加载
+            if 'fa-solid-900' in body or 'fa-brands-400' in body:
+                kept.append(rule.replace('../webfonts/', f'{FONT_AWESOME_CDN}/webfonts/'))
+            continue
+        if selector.startswith('@'):
+            # 动画相关的 @keyframes / @media 模板中没有使用
+            continue
+
+        selectors = []
+        for item in selector.split(','):
+            classes = re.findall(r'\.(fa-[a-z0-9-]+)', item)
+            if all(name in used for name in classes):
+                selectors.append(item)
+        if selectors:
+            kept.append(','.join(selectors) + '{' + body)
+    return ''.join(kept)
+
+def build_icons(source=None):
+    if source and os.path.exists(source):
+        with open(source, encoding='utf-8') as f:
+            css = f.read()
+    else:
+        with urllib.request.urlopen(f'{FONT_AWESOME_CDN}/css/all.min.css', timeout=30) as response:
+            css = response.read().decode('utf-8')
+
+    used = find_used_icons()
+    subset = subset_icons(css, used)
+    with open(ICONS_OUTPUT, 'w', encoding='utf-8') as f:
+        f.write(subset)
+    print(f"Built {ICONS_OUTPUT} with {len(used)} icon classes "
+          f"({len(css.encode())} -> {len(subset.encode())} bytes)")
+
+def main():
+    # 用法: python build_assets.py [path/to/font-awesome/all.min.css]
+    try:
+        build_tailwind()
+        build_icons(sys.argv[1] if len(sys.argv) > 1 else None)
+    except Exception as e:
+        print(f"Asset build failed: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+import os
+import atexit
+import threading
+import time
+import logging
+from datetime import datetime
+
+from shared_cache import cache
+
+logger = logging.getLogger(__name__)
+
+# db-process-dashboard.py 更新数据后修改这个键，刷新线程发现变化后立即重建
+GENERATION_KEY = 'dashboard:generation'
+
+PAGE_STATS_QUERY = """
+    SELECT
+        total_page_views,
+        total_predictions,
+        correct_predictions,
+        accuracy_rate,
+        last_update
+    FROM page_stats
+    WHERE id = 1
+"""
+
+UPCOMING_GAMES_QUERY = """
+    SELECT
+        gpr.game_date,
+        gpr.home_win_probability_logistic,
+        gpr.home_win_probability_rf,
+        ht.team_name as home_team,
+        at.team_name as away_team
+    FROM game_predictions_results gpr
+    JOIN teams ht ON gpr.home_team_id = ht.team_id
+    JOIN teams at ON gpr.away_team_id = at.team_id
+    WHERE gpr.game_date >= CURDATE()
+    ORDER BY gpr.game_date ASC, gpr.id ASC
+    LIMIT 5
+"""
+
+PAGE_VIEWS_UPDATE = """
+    UPDATE page_stats
+    SET total_page_views = total_page_views + %s,
+        last_update = NOW()
+    WHERE id = 1
+"""
+
+def bump_generation():
+    cache.set(GENERATION_KEY, time.time(), ttl=30 * 24 * 3600)
+
+def format_upcoming_game(game):
+    # 计算主队和客队的胜率
+    lr_home_prob = float(game['home_win_probability_logistic'])
+    rf_home_prob = float(game['home_win_probability_rf'])
+
+    return {
+        'game_date': game['game_date'],
+        'home_team_name': game['home_team'],
+        'away_team_name': game['away_team'],
+        'home_win_probability_logistic': lr_home_prob,
+        'away_win_probability_logistic': 1 - lr_home_prob,
+        'home_win_probability_rf': rf_home_prob,
+        'away_win_probability_rf': 1 - rf_home_prob
+    }
+
+# 仪表板数据对所有用户相同：后台线程定时（或数据变化时）构建一份内存快照，
+# 路由只读快照并渲染；访问量在内存中累加，累计到 flush_threshold 次、
+# 距第一次未写回的访问超过 flush_interval 秒、刷新快照或进程退出时批量写回 page_stats
+class DashboardSnapshot:
+    def __init__(self, connect, interval=60, poll_interval=5, flush_threshold=20, flush_interval=30):
+        self.connect = connect
+        self.interval = interval
+        self.poll_interval = poll_interval
+        self.flush_threshold = flush_threshold
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._payload = None
+        self._built_at = 0
+        self._generation = None
+        self._pending_views = 0
+        self._pending_since = None
+        self._flushed_views = 0
+        self._thread = None
+        self._pid = None
+
+    def start(self):
+        # gunicorn fork 之后线程不会被继承，按进程启动
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='dashboard-snapshot', daemon=True)
+            self._thread.start()
+        # worker 回收或正常退出时写回尚未保存的访问量
+        atexit.register(self.flush_views)
+
+    def is_ready(self):
+        return self._payload is not None
+
+    def notify_changed(self):
+        self._wakeup.set()
+
+    def record_page_view(self):
+        with self._lock:
+            self._pending_views += 1
+            if self._pending_since is None:
+                self._pending_since = time.time()
+            due = (self._pending_views >= self.flush_threshold
+                   or time.time() - self._pending_since >= self.flush_interval)
+        # serverless 实例两次调用之间后台线程不运行，在请求中按阈值写回
+        if due:
+            try:
+                self.flush_views(blocking=False)
+            except Exception as e:
+                logger.error(f"Dashboard page view flush failed: {e}")
+
+    def flush_views(self, blocking=True):
+        # 与快照刷新互斥，避免同一批访问量被重复计入；刷新进行中时由刷新负责写回
+        if not self._refresh_lock.acquire(blocking=blocking, timeout=5 if blocking else -1):
+            return
+        try:
+            pending_views = self._take_pending_views()
+            if not pending_views:
+                return
+            try:
+                with self.connect() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(PAGE_VIEWS_UPDATE, (pending_views,))
+                    updated = cursor.rowcount
+                    conn.commit()
+                    cursor.close()
+            except Exception:
+                self._restore_pending_views(pending_views)
+                raise
+            if not updated:
+                # page_stats 还没有初始记录，留给下次快照刷新插入
+                self._restore_pending_views(pending_views)
+                return
+            with self._lock:
+                self._flushed_views += pending_views
+        finally:
+            self._refresh_lock.release()
+
+    def _take_pending_views(self):
+        with self._lock:
+            pending_views = self._pending_views
+            self._pending_views = 0
+            self._pending_since = None
+        return pending_views
+
+    def _restore_pending_views(self, pending_views):
+        with self._lock:
+            self._pending_views += pending_views
+            if self._pending_since is None:
+                self._pending_since = time.time()
+
+    def get(self):
+        self.start()
+        # 首次访问或刷新线程长时间未运行（如 serverless 实例被冻结）时同步构建
+        if self._is_stale():
+            with self._refresh_lock:
+                # 排队等锁期间其他请求可能已经重建完成，只由第一个请求访问数据库
+                if self._is_stale():
+                    self._refresh_locked()
+
+        with self._lock:
+            payload = self._payload
+            pending_views = self._pending_views + self._flushed_views
+        stats = dict(payload['stats'])
+        stats['total_page_views'] += pending_views
+        return stats, payload['upcoming_games']
+
+    def refresh(self):
+        with self._refresh_lock:
+            self._refresh_locked()
+
+    def _is_stale(self):
+        with self._lock:
+            return self._payload is None or time.time() - self._built_at > self.interval * 2
+
+    def _refresh_locked(self):
+        pending_views = self._take_pending_views()
+        try:
+            payload = self._build(pending_views)
+        except Exception:
+            self._restore_pending_views(pending_views)
+            raise
+
+        with self._lock:
+            self._payload = payload
+            self._built_at = time.time()
+            # 之前单独写回的访问量已经包含在新读取的统计中
+            self._flushed_views = 0
+
+    def _build(self, pending_views):
+        with self.connect() as conn:
+            cursor = conn.cursor(dictionary=True)
+
+            # 写回累计的访问量
+            if pending_views:
+                cursor.execute(PAGE_VIEWS_UPDATE, (pending_views,))
+
+            # 获取页面统计数据
+            cursor.execute(PAGE_STATS_QUERY)
+            stats = cursor.fetchone()
+
+            if not stats:
+                stats = {
+                    'total_page_views': pending_views,
+                    'total_predictions': 0,
+                    'correct_predictions': 0,
+                    'accuracy_rate': 0,
+                    'last_update': datetime.now()
+                }
+
+                # 创建初始记录
+                cursor.execute("""
+                    INSERT INTO page_stats
+                        (total_page_views, total_predictions, correct_predictions, accuracy_rate, last_update)
+                    VALUES
+                        (%s, 0, 0, 0, NOW())
+                """, (pending_views,))
+
+            # 获取最近5场比赛的预测
+            cursor.execute(UPCOMING_GAMES_QUERY)
+            upcoming_games = [format_upcoming_game(game) for game in cursor.fetchall()]
+
+            conn.commit()
+            cursor.close()
+
+        return {'stats': stats, 'upcoming_games': upcoming_games}
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            try:
+                generation = cache.get(GENERATION_KEY)
+                changed = generation != self._generation
+                if changed or time.time() - self._built_at >= self.interval:
+                    self.refresh()
+                    self._generation = generation
+            except Exception as e:
+                logger.error(f"Dashboard snapshot refresh failed: {e}")
@@ -3,6 +3,11 @@ import mysql.connector
 from datetime import datetime
 from dotenv import load_dotenv
 import logging
+from shared_cache import cache
+from dashboard_snapshot import bump_generation
+from accuracy_rollups import create_rollup_tables, apply_new_games
+from season_partitions import (create_archive_stats_table, get_hot_start_date, get_archived_totals,
+                               hot_condition, FINISHED_STATS_QUERY)
 
 # 配置日志
 logging.basicConfig(level=logging.INFO,
@@ -75,18 +80,14 @@ def initialize_page_stats(cursor):
         logging.info("Initialized page_stats with default values")
 
 def update_prediction_stats(cursor):
-    # 更新预测统计数据
-    cursor.execute("""
-        SELECT 
-            COUNT(*) as total_predictions,
-            SUM(prediction_correct) as correct_predictions
-        FROM game_predictions_results 
-        WHERE game_status = 3
-    """)
+    # 更新预测统计数据：只扫描未归档的分区，已归档赛季使用归档时的汇总
+    condition, params = hot_condition(get_hot_start_date(cursor))
+    cursor.execute(FINISHED_STATS_QUERY.format(condition), params)
     stats = cursor.fetchone()
+    archived_total, archived_correct = get_archived_totals(cursor)
     
-    total_predictions = stats[0]
-    correct_predictions = stats[1] or 0
+    total_predictions = stats[0] + archived_total
+    correct_predictions = (stats[1] or 0) + archived_correct
     accuracy_rate = (correct_predictions / total_predictions * 100) if total_predictions > 0 else 0
     
     # 更新统计数据
@@ -100,6 +101,13 @@ def update_prediction_stats(cursor):
     """, (total_predictions, correct_predictions, accuracy_rate))
     logging.info("Updated prediction statistics")
 
+def invalidate_shared_cache():
+    for prefix in ('predict:', 'dashboard:', 'analytics:'):
+        removed = cache.delete_prefix(prefix)
+        logging.info(f"Invalidated {removed} shared cache entries with prefix {prefix}")
+    # 通知各 worker 的仪表板刷新线程立即重建快照
+    bump_generation()
+
 def main():
     try:
         conn = get_db_connection()
@@ -115,12 +123,20 @@ def main():
         initialize_page_stats(cursor)
         
         # 更新预测统计
+        create_archive_stats_table(cursor)
         update_prediction_stats(cursor)
         
+        # 增量更新分维度准确率汇总
+        create_rollup_tables(cursor)
+        apply_new_games(cursor, get_hot_start_date(cursor))
+        
         # 提交更改
         conn.commit()
         logging.info("Page statistics updated successfully")
         
+        # 清除共享缓存中的预测数据，让各 worker 重新加载
+        invalidate_shared_cache()
+        
     except Exception as e:
         logging.error(f"Error updating page statistics: {e}")
         if conn:
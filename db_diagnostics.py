@@ -0,0 +1,228 @@
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+import mysql.connector
+from mysql.connector import Error
+
+from dashboard_snapshot import PAGE_STATS_QUERY, UPCOMING_GAMES_QUERY
+from prediction_snapshot import (EXPORT_QUERY, FINGERPRINT_QUERY,
+                                 PREDICTIONS_COUNT_QUERY, PREDICTIONS_PAGE_QUERY)
+from accuracy_rollups import NEW_GAMES_QUERY, BREAKDOWN_QUERY
+from season_partitions import HOT_START_QUERY, ARCHIVED_TOTALS_QUERY, FINISHED_STATS_QUERY, hot_condition
+
+load_dotenv()
+
+# 应用实际读取的列，缺失任何一列都会导致页面出错
+REQUIRED_COLUMNS = {
+    'game_predictions_results': [
+        'id', 'game_date', 'season', 'season_type', 'game_status', 'game_status_text',
+        'home_team_id', 'away_team_id', 'home_team_score', 'away_team_score',
+        'home_win_probability_logistic', 'home_win_probability_rf', 'prediction_correct',
+        'arena_name', 'arena_city'
+    ],
+    'teams': ['team_id', 'team_name'],
+    'page_stats': [
+        'id', 'total_page_views', 'total_predictions', 'correct_predictions',
+        'accuracy_rate', 'last_update'
+    ],
+    'user': ['id', 'username', 'password_hash'],
+}
+
+OPTIONAL_TABLES = ['accuracy_rollups', 'accuracy_rollup_games', 'prediction_archive_stats']
+
+def get_db_connection():
+    return mysql.connector.connect(
+        host=os.environ.get('MYSQLHOST'),
+        user=os.environ.get('MYSQLUSER', 'root'),
+        password=os.environ.get('MYSQLPASSWORD'),
+        database=os.environ.get('MYSQL_DATABASE'),
+        port=int(os.environ.get('MYSQLPORT', '3306'))
+    )
+
+def get_hot_start(cursor):
+    # 与 db-process-dashboard.py 使用相同的热分区起始日期，未归档或表不存在时为 None
+    try:
+        cursor.execute(HOT_START_QUERY)
+        return list(cursor.fetchone().values())[0]
+    except Error:
+        return None
+
+def app_queries(hot_start):
+    # app.py 和 db-process-dashboard.py 实际执行的查询及代表性参数，
+    # SQL 直接引用各模块导出的常量，避免与实际执行的语句不一致
+    today = datetime.now().date()
+    week = "AND game_date BETWEEN %s AND %s"
+    week_params = [today, today + timedelta(days=7)]
+    hot, hot_params = hot_condition(hot_start)
+    rollup_hot, rollup_params = hot_condition(hot_start, 'gpr.game_date')
+
+    return [
+        ('load_user', 'app.py', "SELECT id, username, password_hash FROM `user` WHERE id = %s", [1]),
+        ('login_lookup', 'app.py', "SELECT id, username, password_hash FROM `user` WHERE username = %s LIMIT 1", ['diagnostics']),
+        ('predict_count_7d', 'app.py', PREDICTIONS_COUNT_QUERY.format(week), week_params),
+        ('predict_page_7d', 'app.py', PREDICTIONS_PAGE_QUERY.format(week, 'ASC'), week_params + [10, 0]),
+        ('predict_count_all', 'app.py', PREDICTIONS_COUNT_QUERY.format(''), []),
+        ('predict_page_all_deep', 'app.py', PREDICTIONS_PAGE_QUERY.format('', 'DESC'), [10, 1000]),
+        ('dashboard_stats', 'dashboard_snapshot.py', PAGE_STATS_QUERY, []),
+        ('dashboard_upcoming_games', 'dashboard_snapshot.py', UPCOMING_GAMES_QUERY, []),
+        ('accuracy_breakdown_team', 'accuracy_rollups.py', BREAKDOWN_QUERY, ['team']),
+        ('hot_start_date', 'season_partitions.py', HOT_START_QUERY, []),
+        ('archived_totals', 'season_partitions.py', ARCHIVED_TOTALS_QUERY, []),
+        ('update_prediction_stats', 'db-process-dashboard.py', FINISHED_STATS_QUERY.format(hot), list(hot_params)),
+        ('rollup_new_games', 'accuracy_rollups.py', NEW_GAMES_QUERY.format(rollup_hot), list(rollup_params)),
+        ('snapshot_fingerprint', 'prediction_snapshot.py', FINGERPRINT_QUERY, []),
+        ('snapshot_export', 'prediction_snapshot.py', EXPORT_QUERY, []),
+    ]
+
+def existing_tables(cursor):
+    cursor.execute("""
+        SELECT TABLE_NAME, TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+    """)
+    return {row['TABLE_NAME']: row for row in cursor.fetchall()}
+
+def describe_table(cursor, table, info):
+    cursor.execute(f"SELECT COUNT(*) as count FROM `{table}`")
+    row_count = cursor.fetchone()['count']
+
+    cursor.execute("""
+        SELECT INDEX_NAME, NON_UNIQUE, SEQ_IN_INDEX, COLUMN_NAME, CARDINALITY
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY INDEX_NAME, SEQ_IN_INDEX
+    """, (table,))
+    indexes = {}
+    for row in cursor.fetchall():
+        index = indexes.setdefault(row['INDEX_NAME'], {
+            'unique': not row['NON_UNIQUE'],
+            'columns': [],
+            'cardinality': []
+        })
+        index['columns'].append(row['COLUMN_NAME'])
+        index['cardinality'].append(row['CARDINALITY'])
+
+    return {
+        'exists': True,
+        'row_count': row_count,
+        'estimated_rows': info['TABLE_ROWS'],
+        'data_bytes': info['DATA_LENGTH'],
+        'index_bytes': info['INDEX_LENGTH'],
+        'indexes': indexes
+    }
+
+def check_columns(cursor, tables):
+    results = {}
+    for table, required in REQUIRED_COLUMNS.items():
+        if table not in tables:
+            results[table] = {'ok': False, 'missing': required, 'error': 'table does not exist'}
+            continue
+        cursor.execute("""
+            SELECT COLUMN_NAME FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """, (table,))
+        present = {row['COLUMN_NAME'] for row in cursor.fetchall()}
+        missing = [column for column in required if column not in present]
+        results[table] = {'ok': not missing, 'missing': missing}
+    return results
+
+def explain_query(cursor, sql, params):
+    result = {}
+    # 估算计划（稳定，便于在不同部署之间 diff）
+    cursor.execute(f"EXPLAIN FORMAT=JSON {sql}", params)
+    result['plan'] = json.loads(list(cursor.fetchone().values())[0])
+
+    # 实际执行计划，需要 MySQL 8.0.18+
+    try:
+        cursor.execute(f"EXPLAIN ANALYZE {sql}", params)
+        result['analyze'] = list(cursor.fetchone().values())[0]
+    except Error as e:
+        result['analyze'] = None
+        result['analyze_error'] = str(e)
+    return result
+
+def time_query(cursor, sql, params, runs):
+    timings = []
+    rows = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        rows = len(cursor.fetchall())
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'rows': rows,
+        'min_ms': round(timings[0], 3),
+        'median_ms': round(timings[len(timings) // 2], 3),
+        'max_ms': round(timings[-1], 3)
+    }
+
+def profile_queries(cursor, runs, hot_start):
+    results = []
+    for name, source, sql, params in app_queries(hot_start):
+        entry = {'name': name, 'source': source, 'sql': ' '.join(sql.split()), 'params': params}
+        try:
+            entry.update(explain_query(cursor, sql, params))
+            entry['timing'] = time_query(cursor, sql, params, runs)
+        except Error as e:
+            entry['error'] = str(e)
+        results.append(entry)
+    return results
+
+def run_diagnostics(runs):
+    with get_db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT VERSION() as version, DATABASE() as db")
+        server = cursor.fetchone()
+
+        tables = existing_tables(cursor)
+        table_report = {}
+        for table in list(REQUIRED_COLUMNS) + OPTIONAL_TABLES:
+            if table in tables:
+                table_report[table] = describe_table(cursor, table, tables[table])
+            else:
+                table_report[table] = {'exists': False}
+
+        hot_start = get_hot_start(cursor)
+        report = {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'server_version': server['version'],
+            'database': server['db'],
+            'hot_start': hot_start,
+            'tables': table_report,
+            'columns': check_columns(cursor, tables),
+            'queries': profile_queries(cursor, runs, hot_start)
+        }
+        cursor.close()
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Database diagnostics for the NBA prediction app (JSON output)")
+    parser.add_argument('--output', help="write the JSON report to this file instead of stdout")
+    parser.add_argument('--runs', type=int, default=3, help="timed executions per query")
+    args = parser.parse_args()
+
+    try:
+        report = run_diagnostics(max(args.runs, 1))
+    except Error as e:
+        print(json.dumps({'error': f"Database error: {e}"}))
+        sys.exit(2)
+
+    output = json.dumps(report, indent=2, sort_keys=True, default=str)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    # 应用依赖的列缺失时返回非零退出码，方便在部署流程中拦截
+    if not all(result['ok'] for result in report['columns'].values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+import logging
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+logger = logging.getLogger(__name__)
+
+
+class LoginBusyError(Exception):
+    pass
+
+
+# 内存中的令牌桶限流，每个 key（IP 或用户名）一个桶。
+# 桶按最近使用顺序保存，超过 max_keys 时淘汰最久未使用的桶，每次调用 O(1)
+class TokenBucketLimiter:
+    def __init__(self, rate, capacity, max_keys=10000):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.rate)
+            allowed = tokens >= 1
+            self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return allowed
+
+
+# 密码哈希放到有界线程池中执行：并发数和排队数都有上限，超出时直接拒绝，
+# 避免登录高峰占满 worker 线程拖慢其他页面
+class LoginGuard:
+    def __init__(self, workers=2, queue_limit=8, timeout=5,
+                 ip_rate=0.2, ip_burst=10, user_rate=0.05, user_burst=5):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._ip_limiter = TokenBucketLimiter(ip_rate, ip_burst)
+        self._user_limiter = TokenBucketLimiter(user_rate, user_burst)
+        self._latencies = deque(maxlen=1000)
+        self._latency_lock = threading.Lock()
+        # 用户不存在时对这个哈希做一次同等开销的校验，响应时间不暴露用户是否存在
+        self._dummy_hash = generate_password_hash(os.urandom(16).hex())
+
+    def allow(self, ip, username=None):
+        if not self._ip_limiter.allow(ip):
+            logger.warning(f"Login rate limit exceeded for IP {ip}")
+            return False
+        if username is not None and not self._user_limiter.allow(username.lower()):
+            logger.warning(f"Login rate limit exceeded for username {username}")
+            return False
+        return True
+
+    def check_password(self, password_hash, password):
+        if password_hash is None:
+            self._run(check_password_hash, self._dummy_hash, password or '')
+            return False
+        return self._run(check_password_hash, password_hash, password or '')
+
+    def hash_password(self, password):
+        return self._run(generate_password_hash, password)
+
+    def latency_stats(self):
+        with self._latency_lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return {'count': 0}
+        return {
+            'count': len(samples),
+            'p50_ms': round(samples[len(samples) // 2], 1),
+            'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 1),
+            'max_ms': round(samples[-1], 1)
+        }
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise LoginBusyError("Password hashing queue is full")
+        try:
+            future = self._executor.submit(self._timed, func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        # 任务真正结束（或被取消）后才释放名额，超时的任务仍计入排队上限
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise LoginBusyError("Password hashing timed out")
+
+    def _timed(self, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._latency_lock:
+                self._latencies.append(elapsed)
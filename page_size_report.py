@@ -0,0 +1,168 @@
+import re
+import sys
+import json
+import argparse
+import urllib.request
+import urllib.error
+from http.cookiejar import CookieJar
+from urllib.parse import urljoin, urlencode, urlparse
+
+# 用法: python page_size_report.py [base_url] [--username U --password P] [--output after.json] [--baseline before.json]
+# 分别以不压缩 / gzip / br 请求每个页面及其引用的 CSS、JS，输出传输字节数。
+# 在执行 build_assets.py 之前用 --output 保存一份 JSON，之后用 --baseline 指向它即可输出差值。
+
+PUBLIC_PAGES = ['/', '/login', '/register', '/predict', '/predict?date_filter=all']
+LOGIN_PAGES = ['/dashboard', '/models', '/analytics']
+ENCODINGS = ['identity', 'gzip', 'br']
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    # 不自动跟随跳转：需要登录的页面被重定向到 /login 时要如实报告，而不是测量登录页
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+def build_opener():
+    return urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()), NoRedirect())
+
+
+def login(opener, base_url, username, password):
+    data = urlencode({'username': username, 'password': password}).encode()
+    try:
+        with opener.open(urljoin(base_url, '/login'), data=data, timeout=30) as response:
+            # 登录失败时重新渲染登录页（200），成功时跳转到 /dashboard
+            raise RuntimeError(f"Login as {username} failed (HTTP {response.status})")
+    except urllib.error.HTTPError as e:
+        if e.code not in (301, 302, 303) or urlparse(e.headers.get('Location', '')).path == '/login':
+            raise RuntimeError(f"Login as {username} failed (HTTP {e.code})")
+
+
+def fetch_size(opener, url, encoding):
+    request = urllib.request.Request(url, headers={'Accept-Encoding': encoding})
+    try:
+        with opener.open(request, timeout=30) as response:
+            body = response.read()
+            return len(body), response.headers.get('Content-Encoding', 'identity'), body
+    except urllib.error.HTTPError as e:
+        if 300 <= e.code < 400:
+            print(f"  ! {url} ({encoding}): redirected to {e.headers.get('Location')}, log in with --username/--password")
+        else:
+            print(f"  ! {url} ({encoding}): HTTP {e.code}")
+        return 0, 'error', b''
+    except Exception as e:
+        print(f"  ! {url} ({encoding}): {e}")
+        return 0, 'error', b''
+
+
+def find_assets(page_url, html):
+    assets = re.findall(r'<link[^>]+rel="stylesheet"[^>]+href="([^"]+)"', html)
+    assets += re.findall(r'<script[^>]+src="([^"]+)"', html)
+    return [urljoin(page_url, asset) for asset in assets]
+
+
+def as_sizes(values):
+    return dict(zip(ENCODINGS, values))
+
+
+def collect(opener, base_url, pages):
+    report = {'base_url': base_url, 'pages': {}, 'assets': {}}
+    for page in pages:
+        url = urljoin(base_url, page)
+        sizes = []
+        html = ''
+        for encoding in ENCODINGS:
+            size, content_encoding, body = fetch_size(opener, url, encoding)
+            sizes.append(size)
+            if content_encoding == 'identity' and body:
+                html = body.decode('utf-8', errors='replace')
+
+        # 页面自身 + 引用的静态资源（同一资源只统计一次）
+        page_totals = list(sizes)
+        for asset in find_assets(url, html):
+            if asset not in report['assets']:
+                report['assets'][asset] = as_sizes(
+                    fetch_size(opener, asset, encoding)[0] for encoding in ENCODINGS)
+            page_totals = [a + b for a, b in zip(page_totals, report['assets'][asset].values())]
+        report['pages'][page] = {'html': as_sizes(sizes), 'with_assets': as_sizes(page_totals)}
+
+    report['totals'] = {
+        'html': as_sizes(sum(entry['html'][encoding] for entry in report['pages'].values())
+                         for encoding in ENCODINGS),
+        'assets': as_sizes(sum(sizes[encoding] for sizes in report['assets'].values())
+                           for encoding in ENCODINGS),
+    }
+    return report
+
+
+def format_row(label, sizes, signed=False):
+    number = '{:>+12,}' if signed else '{:>12,}'
+    return f"{label:<60}" + ''.join(number.format(sizes[encoding]) for encoding in ENCODINGS)
+
+
+def print_delta(current, previous):
+    # 基线中没有的页面不输出差值
+    if previous:
+        print(format_row('    vs baseline', {encoding: current[encoding] - previous.get(encoding, 0)
+                                             for encoding in ENCODINGS}, signed=True))
+
+
+def print_report(report, baseline=None):
+    baseline = baseline or {}
+    base_pages = baseline.get('pages', {})
+    base_totals = baseline.get('totals', {})
+
+    print(f"{'Resource':<60}" + ''.join(f"{encoding:>12}" for encoding in ENCODINGS))
+    for page, entry in report['pages'].items():
+        print(format_row(page, entry['html']))
+        print_delta(entry['html'], base_pages.get(page, {}).get('html'))
+        print(format_row('  + linked CSS/JS', entry['with_assets']))
+        print_delta(entry['with_assets'], base_pages.get(page, {}).get('with_assets'))
+
+    print()
+    for asset, sizes in report['assets'].items():
+        print(format_row(asset[-60:], sizes))
+    print()
+    print(format_row('Total HTML', report['totals']['html']))
+    print_delta(report['totals']['html'], base_totals.get('html'))
+    print(format_row('Total unique assets', report['totals']['assets']))
+    print_delta(report['totals']['assets'], base_totals.get('assets'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-page transfer size report (identity / gzip / br)")
+    parser.add_argument('base_url', nargs='?', default='http://127.0.0.1:5000')
+    parser.add_argument('pages', nargs='*', help="paths to measure (default: all pages)")
+    parser.add_argument('--username', help="log in first so pages behind @login_required are measured")
+    parser.add_argument('--password')
+    parser.add_argument('--output', help="write the report as JSON to this file")
+    parser.add_argument('--baseline', help="JSON report from an earlier run to print deltas against")
+    args = parser.parse_args()
+
+    opener = build_opener()
+    if args.username:
+        try:
+            login(opener, args.base_url, args.username, args.password or '')
+        except RuntimeError as e:
+            print(e)
+            sys.exit(1)
+
+    pages = args.pages or PUBLIC_PAGES + (LOGIN_PAGES if args.username else [])
+    if not args.username and not args.pages:
+        print(f"Skipping {', '.join(LOGIN_PAGES)} (pass --username/--password to include them)")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    report = collect(opener, args.base_url, pages)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+import os
+import sys
+import sqlite3
+import time
+import logging
+from datetime import date
+from decimal import Decimal
+
+from dotenv import load_dotenv
+import mysql.connector
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+SNAPSHOT_PATH = os.environ.get('PREDICTION_SNAPSHOT_PATH')
+# 快照最长有效时间（秒），超过后回退到 MySQL；定时任务每次导出或 --check 都会刷新。
+# 0 表示不限制（定时任务停止后会一直提供旧数据，不建议）
+SNAPSHOT_MAX_AGE = int(os.environ.get('PREDICTION_SNAPSHOT_MAX_AGE', '1800'))
+
+_stale_warned = False
+
+SNAPSHOT_COLUMNS = [
+    ('id', 'INTEGER PRIMARY KEY'),
+    ('game_date', 'TEXT NOT NULL'),
+    ('season', 'TEXT'),
+    ('season_type', 'TEXT'),
+    ('game_status', 'INTEGER'),
+    ('game_status_text', 'TEXT'),
+    ('home_team_score', 'INTEGER'),
+    ('away_team_score', 'INTEGER'),
+    ('home_win_probability_logistic', 'REAL'),
+    ('home_win_probability_rf', 'REAL'),
+    ('prediction_correct', 'INTEGER'),
+    ('arena_name', 'TEXT'),
+    ('arena_city', 'TEXT'),
+    ('home_team', 'TEXT'),
+    ('away_team', 'TEXT'),
+]
+
+EXPORT_QUERY = """
+    SELECT
+        gpr.id,
+        gpr.game_date,
+        gpr.season,
+        gpr.season_type,
+        gpr.game_status,
+        gpr.game_status_text,
+        gpr.home_team_score,
+        gpr.away_team_score,
+        gpr.home_win_probability_logistic,
+        gpr.home_win_probability_rf,
+        gpr.prediction_correct,
+        gpr.arena_name,
+        gpr.arena_city,
+        ht.team_name as home_team,
+        at.team_name as away_team
+    FROM game_predictions_results gpr
+    JOIN teams ht ON gpr.home_team_id = ht.team_id
+    JOIN teams at ON gpr.away_team_id = at.team_id
+    ORDER BY gpr.game_date ASC, gpr.id ASC
+"""
+
+# app.py 在没有可用快照时对 MySQL 执行的分页查询，
+# {0} 为 build_date_filter 生成的日期条件，{1} 为排序方向
+PREDICTIONS_COUNT_QUERY = "SELECT COUNT(*) as count FROM game_predictions_results WHERE 1=1 {0}"
+
+PREDICTIONS_PAGE_QUERY = """
+    SELECT
+        gpr.id,
+        gpr.game_date,
+        gpr.season,
+        gpr.season_type,
+        gpr.game_status,
+        gpr.game_status_text,
+        gpr.home_team_score,
+        gpr.away_team_score,
+        gpr.home_win_probability_logistic,
+        gpr.home_win_probability_rf,
+        gpr.prediction_correct,
+        gpr.arena_name,
+        gpr.arena_city,
+        ht.team_name as home_team,
+        at.team_name as away_team
+    FROM game_predictions_results gpr
+    JOIN teams ht ON gpr.home_team_id = ht.team_id
+    JOIN teams at ON gpr.away_team_id = at.team_id
+    WHERE 1=1 {0}
+    ORDER BY gpr.game_date {1}, gpr.id {1}
+    LIMIT %s OFFSET %s
+"""
+
+# 主库指纹：与 EXPORT_QUERY 相同的连接，对快照写入的每一列计算逐行 CRC32 再异或，
+# 比赛新增/删除、改期、比分、状态文字、场馆、概率或球队名称的任何变化都会改变结果；
+# NULL 换成空串，避免 CONCAT_WS 跳过 NULL 导致相邻列错位
+FINGERPRINT_QUERY = """
+    SELECT
+        COUNT(*),
+        BIT_XOR(CRC32(CONCAT_WS('|',
+            gpr.id,
+            COALESCE(gpr.game_date, ''),
+            COALESCE(gpr.season, ''),
+            COALESCE(gpr.season_type, ''),
+            COALESCE(gpr.game_status, ''),
+            COALESCE(gpr.game_status_text, ''),
+            COALESCE(gpr.home_team_score, ''),
+            COALESCE(gpr.away_team_score, ''),
+            COALESCE(gpr.home_win_probability_logistic, ''),
+            COALESCE(gpr.home_win_probability_rf, ''),
+            COALESCE(gpr.prediction_correct, ''),
+            COALESCE(gpr.arena_name, ''),
+            COALESCE(gpr.arena_city, ''),
+            COALESCE(ht.team_name, ''),
+            COALESCE(at.team_name, '')
+        )))
+    FROM game_predictions_results gpr
+    JOIN teams ht ON gpr.home_team_id = ht.team_id
+    JOIN teams at ON gpr.away_team_id = at.team_id
+"""
+
+def get_db_connection():
+    return mysql.connector.connect(
+        host=os.getenv('MYSQLHOST'),
+        user=os.getenv('MYSQLUSER', 'root'),
+        password=os.getenv('MYSQLPASSWORD'),
+        database=os.getenv('MYSQL_DATABASE'),
+        port=int(os.getenv('MYSQLPORT', 3306))
+    )
+
+def primary_fingerprint(cursor):
+    cursor.execute(FINGERPRINT_QUERY)
+    return '|'.join('' if value is None else str(value) for value in cursor.fetchone())
+
+def _to_sqlite_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+def export_snapshot(mysql_conn, path):
+    cursor = mysql_conn.cursor()
+    try:
+        fingerprint = primary_fingerprint(cursor)
+        cursor.execute(EXPORT_QUERY)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    # 先写临时文件，再用 os.replace 原子替换，读者不会看到写了一半的快照
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        columns = ', '.join(f"{name} {column_type}" for name, column_type in SNAPSHOT_COLUMNS)
+        conn.execute(f"CREATE TABLE predictions ({columns})")
+        conn.execute("CREATE TABLE snapshot_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        placeholders = ', '.join('?' for _ in SNAPSHOT_COLUMNS)
+        conn.executemany(
+            f"INSERT INTO predictions VALUES ({placeholders})",
+            ([_to_sqlite_value(value) for value in row] for row in rows)
+        )
+        conn.execute("CREATE INDEX idx_predictions_date_id ON predictions (game_date, id)")
+        conn.executemany("INSERT INTO snapshot_meta VALUES (?, ?)", [
+            ('fingerprint', fingerprint),
+            ('exported_at', str(time.time())),
+            ('row_count', str(len(rows))),
+        ])
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+    logger.info(f"Exported {len(rows)} predictions to snapshot {path}")
+    return len(rows)
+
+def read_snapshot_meta(path):
+    conn = _open_snapshot(path)
+    try:
+        return dict(conn.execute("SELECT key, value FROM snapshot_meta").fetchall())
+    finally:
+        conn.close()
+
+def is_snapshot_fresh(mysql_conn, path):
+    if not os.path.exists(path):
+        return False
+    cursor = mysql_conn.cursor()
+    try:
+        fingerprint = primary_fingerprint(cursor)
+    finally:
+        cursor.close()
+    return read_snapshot_meta(path).get('fingerprint') == fingerprint
+
+def _open_snapshot(path):
+    # 快照文件只会被整体替换，不会原地修改，可以按 immutable 方式只读打开
+    conn = sqlite3.connect(f"file:{path}?mode=ro&immutable=1", uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def snapshot_age():
+    # 距离上次导出或 --check 确认的秒数，快照不存在时返回 None
+    if not SNAPSHOT_PATH or not os.path.exists(SNAPSHOT_PATH):
+        return None
+    return time.time() - os.path.getmtime(SNAPSHOT_PATH)
+
+def snapshot_enabled():
+    global _stale_warned
+    age = snapshot_age()
+    if age is None:
+        return False
+    if SNAPSHOT_MAX_AGE and age > SNAPSHOT_MAX_AGE:
+        # 每次过期只告警一次，避免每个请求都写日志
+        if not _stale_warned:
+            logger.warning(f"Prediction snapshot {SNAPSHOT_PATH} is {age:.0f}s old "
+                           f"(max {SNAPSHOT_MAX_AGE}s), falling back to MySQL")
+            _stale_warned = True
+        return False
+    _stale_warned = False
+    return True
+
+def _row_to_dict(row):
+    record = dict(row)
+    record['game_date'] = date.fromisoformat(record['game_date'])
+    return record
+
+def query_snapshot(date_condition, query_params, sort_order, per_page, offset):
+    # date_condition 与 MySQL 查询共用（只引用 game_date），换成 sqlite 的占位符
+    condition = date_condition.replace('%s', '?')
+    params = [_to_sqlite_value(param) for param in query_params]
+    direction = 'ASC' if sort_order == 'asc' else 'DESC'
+
+    conn = _open_snapshot(SNAPSHOT_PATH)
+    try:
+        total_records = conn.execute(
+            f"SELECT COUNT(*) FROM predictions WHERE 1=1 {condition}", params
+        ).fetchone()[0]
+        rows = conn.execute(
+            f"""
+                SELECT * FROM predictions
+                WHERE 1=1 {condition}
+                ORDER BY game_date {direction}, id {direction}
+                LIMIT ? OFFSET ?
+            """,
+            params + [per_page, offset]
+        ).fetchall()
+        return total_records, [_row_to_dict(row) for row in rows]
+    finally:
+        conn.close()
+
+def main():
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    path = SNAPSHOT_PATH or 'predictions-snapshot.sqlite3'
+    check_only = '--check' in sys.argv[1:]
+
+    conn = get_db_connection()
+    try:
+        # --check: 与主库指纹一致时跳过导出
+        if check_only and is_snapshot_fresh(conn, path):
+            # 刷新修改时间，避免被 PREDICTION_SNAPSHOT_MAX_AGE 判定为过期
+            os.utime(path)
+            logging.info(f"Snapshot {path} is up to date")
+            return
+        export_snapshot(conn, path)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
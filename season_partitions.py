@@ -0,0 +1,230 @@
+import os
+import re
+import sys
+import logging
+from datetime import timedelta
+
+from dotenv import load_dotenv
+import mysql.connector
+
+from accuracy_rollups import create_rollup_tables, apply_new_games
+
+# 加载环境变量
+load_dotenv()
+
+TABLE = 'game_predictions_results'
+
+def get_db_connection():
+    return mysql.connector.connect(
+        host=os.getenv('MYSQLHOST'),
+        user=os.getenv('MYSQLUSER'),
+        password=os.getenv('MYSQLPASSWORD'),
+        database=os.getenv('MYSQL_DATABASE'),
+        port=int(os.getenv('MYSQLPORT', 3306))
+    )
+
+def create_archive_stats_table(cursor):
+    # 已归档赛季的汇总数据，归档后统计不再需要扫描这些分区
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS prediction_archive_stats (
+            season VARCHAR(20) PRIMARY KEY,
+            total_predictions INT NOT NULL,
+            correct_predictions INT NOT NULL,
+            first_game_date DATE NOT NULL,
+            archived_until DATE NOT NULL,
+            archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+HOT_START_QUERY = "SELECT MAX(archived_until) FROM prediction_archive_stats"
+
+ARCHIVED_TOTALS_QUERY = """
+    SELECT
+        COALESCE(SUM(total_predictions), 0),
+        COALESCE(SUM(correct_predictions), 0)
+    FROM prediction_archive_stats
+"""
+
+# db-process-dashboard.py 统计已结束比赛时执行，{0} 为 hot_condition 生成的分区裁剪条件
+FINISHED_STATS_QUERY = """
+    SELECT
+        COUNT(*) as total_predictions,
+        SUM(prediction_correct) as correct_predictions
+    FROM game_predictions_results
+    WHERE game_status = 3
+    {0}
+"""
+
+def get_hot_start_date(cursor):
+    # 热数据起始日期：所有归档赛季之后的第一天，未归档任何赛季时返回 None
+    cursor.execute(HOT_START_QUERY)
+    return cursor.fetchone()[0]
+
+def get_archived_totals(cursor):
+    cursor.execute(ARCHIVED_TOTALS_QUERY)
+    total_predictions, correct_predictions = cursor.fetchone()
+    return int(total_predictions), int(correct_predictions)
+
+def hot_condition(hot_start, column='game_date'):
+    # 供查询拼接的分区裁剪条件，只访问未归档的分区
+    if hot_start is None:
+        return "", ()
+    return f"AND {column} >= %s", (hot_start,)
+
+def get_seasons(cursor):
+    cursor.execute(f"""
+        SELECT season, MIN(game_date), MAX(game_date), SUM(game_status <> 3)
+        FROM {TABLE}
+        GROUP BY season
+        ORDER BY MIN(game_date)
+    """)
+    return cursor.fetchall()
+
+def partition_name(season):
+    return 's' + re.sub(r'\W', '_', str(season))
+
+def build_partition_clause(seasons, hot_start):
+    partitions = []
+    if hot_start is not None:
+        partitions.append(f"PARTITION p_archive VALUES LESS THAN ('{hot_start.isoformat()}')")
+
+    hot_seasons = [row for row in seasons if hot_start is None or row[1] >= hot_start]
+    for index, (season, first_date, _, _) in enumerate(hot_seasons[:-1]):
+        next_start = hot_seasons[index + 1][1]
+        partitions.append(f"PARTITION {partition_name(season)} VALUES LESS THAN ('{next_start.isoformat()}')")
+
+    # 最新赛季（以及之后新增的比赛）放在 MAXVALUE 分区，新赛季开始后重新执行 partition 即可拆分
+    last_name = partition_name(hot_seasons[-1][0]) if hot_seasons else 'p_current'
+    partitions.append(f"PARTITION {last_name} VALUES LESS THAN (MAXVALUE)")
+
+    return "PARTITION BY RANGE COLUMNS(game_date) (\n    " + ",\n    ".join(partitions) + "\n)"
+
+def check_partitionable(cursor):
+    # MySQL 要求所有唯一索引都包含分区列，且分区表不支持外键
+    cursor.execute("""
+        SELECT INDEX_NAME, GROUP_CONCAT(COLUMN_NAME)
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND NON_UNIQUE = 0
+        GROUP BY INDEX_NAME
+    """, (TABLE,))
+    unique_keys = {name: columns.split(',') for name, columns in cursor.fetchall()}
+
+    cursor.execute("""
+        SELECT CONSTRAINT_NAME
+        FROM information_schema.REFERENTIAL_CONSTRAINTS
+        WHERE CONSTRAINT_SCHEMA = DATABASE() AND (TABLE_NAME = %s OR REFERENCED_TABLE_NAME = %s)
+    """, (TABLE, TABLE))
+    foreign_keys = [row[0] for row in cursor.fetchall()]
+    if foreign_keys:
+        raise ValueError(f"Cannot partition {TABLE}: drop foreign keys first ({', '.join(foreign_keys)})")
+
+    blocking = [name for name, columns in unique_keys.items()
+                if name != 'PRIMARY' and 'game_date' not in columns]
+    if blocking:
+        raise ValueError(f"Cannot partition {TABLE}: unique keys without game_date ({', '.join(blocking)})")
+
+    return 'game_date' in unique_keys.get('PRIMARY', [])
+
+def apply_partitioning(cursor):
+    primary_key_ready = check_partitionable(cursor)
+    if not primary_key_ready:
+        cursor.execute(f"ALTER TABLE {TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY (id, game_date)")
+        logging.info(f"Changed {TABLE} primary key to (id, game_date)")
+
+    clause = build_partition_clause(get_seasons(cursor), get_hot_start_date(cursor))
+    cursor.execute(f"ALTER TABLE {TABLE} {clause}")
+    logging.info(f"Partitioned {TABLE}:\n{clause}")
+
+def archive_season(cursor, season):
+    seasons = get_seasons(cursor)
+    season_rows = {str(row[0]): row for row in seasons}
+    if season not in season_rows:
+        raise ValueError(f"Unknown season: {season}")
+
+    # 归档范围必须从最早的赛季开始连续，且这些赛季的比赛都已结束
+    last_date = season_rows[season][2]
+    to_archive = [row for row in seasons if row[2] <= last_date]
+    unfinished = [str(row[0]) for row in to_archive if row[3]]
+    if unfinished:
+        raise ValueError(f"Seasons still have unfinished games: {', '.join(unfinished)}")
+
+    # 归档前先把已结束的比赛计入准确率汇总，之后汇总只需扫描热分区
+    create_rollup_tables(cursor)
+    apply_new_games(cursor)
+
+    archived_until = last_date + timedelta(days=1)
+    for season_name, first_date, _, _ in to_archive:
+        cursor.execute(f"""
+            SELECT COUNT(*), COALESCE(SUM(prediction_correct), 0)
+            FROM {TABLE}
+            WHERE season = %s AND game_status = 3
+        """, (season_name,))
+        total_predictions, correct_predictions = cursor.fetchone()
+        cursor.execute("""
+            INSERT INTO prediction_archive_stats
+                (season, total_predictions, correct_predictions, first_game_date, archived_until)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                total_predictions = VALUES(total_predictions),
+                correct_predictions = VALUES(correct_predictions),
+                first_game_date = VALUES(first_game_date),
+                archived_until = VALUES(archived_until)
+        """, (season_name, total_predictions, correct_predictions, first_date, archived_until))
+        logging.info(f"Archived season {season_name}: {total_predictions} finished games")
+
+def show_status(cursor):
+    cursor.execute("""
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """, (TABLE,))
+    for name, description, rows in cursor.fetchall():
+        logging.info(f"{name or '(not partitioned)'}: < {description}, ~{rows} rows")
+    logging.info(f"Hot data starts at: {get_hot_start_date(cursor) or 'all seasons are hot'}")
+
+def main():
+    # 配置日志
+    logging.basicConfig(level=logging.INFO,
+                       format='%(asctime)s - %(levelname)s - %(message)s')
+
+    usage = "Usage: python season_partitions.py status | partition | archive <season>"
+    if len(sys.argv) < 2 or sys.argv[1] not in ('status', 'partition', 'archive'):
+        print(usage)
+        sys.exit(1)
+
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        create_archive_stats_table(cursor)
+
+        command = sys.argv[1]
+        if command == 'status':
+            show_status(cursor)
+        elif command == 'partition':
+            apply_partitioning(cursor)
+        else:
+            if len(sys.argv) < 3:
+                print(usage)
+                sys.exit(1)
+            archive_season(cursor, sys.argv[2])
+            conn.commit()
+            # 重新划分分区，把归档赛季合并进 p_archive
+            apply_partitioning(cursor)
+
+        conn.commit()
+    except Exception as e:
+        logging.error(f"Error managing season partitions: {e}")
+        if conn:
+            conn.rollback()
+        sys.exit(1)
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import os
+import stat
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# 缓存命中时 accessed_at 最多每隔这么多秒写回一次
+ACCESS_UPDATE_INTERVAL = 60
+
+
+def get_default_cache_path():
+    # 优先放在 tmpfs (/dev/shm)，同一台机器上的所有 worker 共用一个文件；
+    # /dev/shm 对所有用户可写，因此放在按 uid 区分的私有目录中
+    base_dir = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base_dir, f'nba-flask-cache-{os.getuid()}', 'cache.sqlite3')
+
+
+def ensure_private_dir(directory):
+    # 缓存文件中的 pickle 数据会被直接反序列化，目录必须只有当前用户可写，
+    # 否则其他本地用户可以预先放入恶意文件
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"Cache directory {directory} is not a directory")
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"Cache directory {directory} is not owned by the current user")
+    if info.st_mode & 0o077:
+        raise PermissionError(f"Cache directory {directory} is accessible by other users")
+
+
+# 基于 SQLite (WAL 模式) 的主机级共享缓存：所有 gunicorn worker 和
+# db-process-dashboard.py 任务共用同一个文件，写入在单个事务中完成，
+# 条目按 TTL 过期，并在超过条数/大小限制时按最近访问时间淘汰。
+# 文件所在目录必须只有当前用户可访问（见 ensure_private_dir）
+class SharedCache:
+    def __init__(self, path=None, max_entries=1000, max_bytes=32 * 1024 * 1024, default_ttl=300):
+        self.path = path or get_default_cache_path()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.disabled = False
+        self._local = threading.local()
+
+    def _connect(self):
+        # sqlite 连接不能跨线程/进程共享，按线程缓存并在 fork 后重建；
+        # 缓存目录不安全时返回 None，之后的调用直接跳过缓存
+        if self.disabled:
+            return None
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        try:
+            ensure_private_dir(os.path.dirname(os.path.abspath(self.path)))
+        except OSError as e:
+            # 只记录一次，避免每个请求都重复检查目录并写 ERROR 日志
+            self.disabled = True
+            logger.error(f"Shared cache disabled: {e}")
+            return None
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache_entries (expires_at)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries (accessed_at)')
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key, default=None):
+        try:
+            conn = self._connect()
+            if conn is None:
+                return default
+            row = conn.execute(
+                'SELECT value, expires_at, accessed_at FROM cache_entries WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return default
+
+            now = time.time()
+            if row[1] <= now:
+                conn.execute('DELETE FROM cache_entries WHERE key = ? AND expires_at <= ?', (key, now))
+                return default
+
+            # 命中时不必每次都写：所有 worker 共用一把 SQLite 写锁，
+            # 访问时间精确到 ACCESS_UPDATE_INTERVAL 对 LRU 淘汰已经足够
+            if now - row[2] >= ACCESS_UPDATE_INTERVAL:
+                conn.execute('UPDATE cache_entries SET accessed_at = ? WHERE key = ?', (now, key))
+            return pickle.loads(row[0])
+        except (sqlite3.Error, OSError, pickle.UnpicklingError) as e:
+            logger.error(f"Shared cache read failed for {key}: {e}")
+            return default
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            logger.warning(f"Shared cache entry {key} exceeds max_bytes, not cached")
+            return False
+
+        now = time.time()
+        try:
+            conn = self._connect()
+            if conn is None:
+                return False
+            # BEGIN IMMEDIATE 先拿写锁，写入和淘汰在同一个事务里原子完成
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute("""
+                    INSERT OR REPLACE INTO cache_entries (key, value, size, expires_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (key, sqlite3.Binary(payload), len(payload), now + ttl, now))
+                self._evict(conn, now)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            return True
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Shared cache write failed for {key}: {e}")
+            return False
+
+    def get_or_set(self, key, loader, ttl=None):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = loader()
+            self.set(key, value, ttl)
+        return value
+
+    def delete(self, key):
+        try:
+            conn = self._connect()
+            if conn is not None:
+                conn.execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Shared cache delete failed for {key}: {e}")
+
+    def delete_prefix(self, prefix):
+        try:
+            conn = self._connect()
+            if conn is None:
+                return 0
+            cursor = conn.execute(
+                'DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?', (len(prefix), prefix)
+            )
+            return cursor.rowcount
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Shared cache invalidation failed for {prefix}: {e}")
+            return 0
+
+    def clear(self):
+        try:
+            conn = self._connect()
+            if conn is not None:
+                conn.execute('DELETE FROM cache_entries')
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Shared cache clear failed: {e}")
+
+    def _evict(self, conn, now):
+        # 先清理过期数据，再按最近访问时间淘汰，直到满足条数和大小限制
+        conn.execute('DELETE FROM cache_entries WHERE expires_at <= ?', (now,))
+        count, total_size = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries'
+        ).fetchone()
+        if count <= self.max_entries and total_size <= self.max_bytes:
+            return
+
+        rows = conn.execute(
+            'SELECT key, size FROM cache_entries ORDER BY accessed_at ASC'
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if count <= self.max_entries and total_size <= self.max_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            total_size -= size
+        conn.executemany('DELETE FROM cache_entries WHERE key = ?', evicted)
+
+
+cache = SharedCache(
+    path=os.environ.get('CACHE_PATH'),
+    max_entries=int(os.environ.get('CACHE_MAX_ENTRIES', '1000')),
+    max_bytes=int(os.environ.get('CACHE_MAX_BYTES', str(32 * 1024 * 1024))),
+    default_ttl=int(os.environ.get('CACHE_DEFAULT_TTL', '300'))
+)
@@ -0,0 +1,11 @@
+/** @type {import('tailwindcss').Config} */
+module.exports = {
+  content: [
+    './templates/**/*.html',
+    './static/js/**/*.js'
+  ],
+  theme: {
+    extend: {}
+  },
+  plugins: []
+}